@@ -1,22 +1,105 @@
-import aiofile
-from aiopath import AsyncPath
+import asyncio
+import os
 from datetime import datetime
+from time import time
+
+DRAIN_INTERVAL = 0.05
+BUFFER_SIZE = 128 * 1024
 
 class AsyncLogger:
-    def __init__(self, date_format: str):
+    def __init__(self, date_format: str, flush_interval: float=1.0,
+                 flush_bytes: int=64 * 1024, fsync: bool=False):
         self.date_format = date_format
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        #fsync=True trades throughput for durability on every flush
+        self.fsync = fsync
         self.file = None
+        self._raw = None
+        self._queue = asyncio.Queue()
+        self._flusher_task = None
+        self._pending_bytes = 0
+        #Sub-second formats can't reuse a cached timestamp
+        self._stamp_per_call = "%f" in date_format
+        self._last_sec = 0
+        self._last_stamp = ""
+
+    def _timestamp(self) -> str:
+        if self._stamp_per_call:
+            return datetime.now().strftime(self.date_format)
+        sec = int(time())
+        if sec != self._last_sec:
+            self._last_stamp = datetime.fromtimestamp(sec).strftime(self.date_format)
+            self._last_sec = sec
+        return self._last_stamp
 
     async def set_file(self, file: str):
-        path = AsyncPath(file)
-        if not await path.is_file():
-            await path.touch(file)
-        self.file = path
+        self.file = file
+        self._raw = open(file, "ab", buffering=BUFFER_SIZE)
+        self._flusher_task = asyncio.create_task(self._flush_loop())
 
     async def log(self, message: str):
-        log_message = f"At {datetime.now().strftime(self.date_format)}: {message}\n"
-        if self.file is None:
+        log_message = f"At {self._timestamp()}: {message}\n"
+        if self._raw is None:
             print(log_message)
         else:
-            async with aiofile.async_open(self.file, "a") as alog:
-                await alog.write(log_message)
\ No newline at end of file
+            self._queue.put_nowait(log_message)
+
+    async def _write(self, data: bytes):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._raw.write, data)
+        self._pending_bytes += len(data)
+
+    async def flush(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._raw.flush)
+        if self.fsync:
+            await loop.run_in_executor(None, os.fsync, self._raw.fileno())
+        self._pending_bytes = 0
+
+    async def _flush_loop(self):
+        loop = asyncio.get_running_loop()
+        last_flush = loop.time()
+        while True:
+            #Timed wait so the interval flush fires even with no new messages;
+            #asyncio.timeout (unlike wait_for) lets aclose's cancel through
+            try:
+                async with asyncio.timeout(self.flush_interval):
+                    buf = [await self._queue.get()]
+            except TimeoutError:
+                buf = []
+            while True:
+                try:
+                    buf.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            if buf:
+                await self._write("".join(buf).encode())
+            now = loop.time()
+            #Flush on elapsed time or accumulated size, whichever first
+            if self._pending_bytes and (now - last_flush >= self.flush_interval
+                    or self._pending_bytes >= self.flush_bytes):
+                await self.flush()
+                last_flush = now
+            if buf:
+                await asyncio.sleep(DRAIN_INTERVAL)
+
+    async def aclose(self):
+        if self._raw is None:
+            return
+        if self._flusher_task is not None:
+            self._flusher_task.cancel()
+            #Wait it out: a cancelled flusher may still be mid-write
+            try:
+                await self._flusher_task
+            except asyncio.CancelledError:
+                pass
+            self._flusher_task = None
+        buf = []
+        while not self._queue.empty():
+            buf.append(self._queue.get_nowait())
+        if buf:
+            await self._write("".join(buf).encode())
+        await self.flush()
+        self._raw.close()
+        self._raw = None
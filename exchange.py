@@ -1,35 +1,70 @@
 import aiohttp
 import asyncio
-import platform
+import orjson
 from datetime import date, timedelta
 from time import time
-from sys import argv
-from functools import wraps
+from sys import argv, platform
+from functools import lru_cache, wraps
 from pprint import pprint
 from typing import Iterable
 
+#aiohttp needs the selector loop on Windows; set it once at import
+if platform == 'win32':
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
 url = "https://api.privatbank.ua/p24api/exchange_rates?json&date="
-base_currency = ["EUR", "USD"]
+BASE_CURRENCY: tuple[str, ...] = ("EUR", "USD")
 
 DATE_FORMAT = "%d.%m.%Y"
 MAX_DAYS = 10
+REQUEST_TIMEOUT = 5
+MAX_CONCURRENT_REQUESTS = 4
+
+#Parsed rates per date: past dates never change, today's entry expires
+_RATE_CACHE: dict[date, dict] = {}
+_CACHE_TIME: dict[date, float] = {}
+_TODAY_TTL = 6 * 3600
+
+_session: aiohttp.ClientSession | None = None
+
+async def get_session() -> aiohttp.ClientSession:
+    """Returns the shared ClientSession, lazily created on first use.
+
+    One session per process keeps the connection pool warm, so repeated
+    requests reuse DNS results and open TLS connections.
+    """
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(limit=100, limit_per_host=10,
+                                         enable_cleanup_closed=True)
+        _session = aiohttp.ClientSession(connector=connector)
+    return _session
+
+async def close_session():
+    """Closes the shared ClientSession on shutdown"""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
 API_CURRENCIES = frozenset((
     "AUD", "AZN", "BYN", "CAD", "CHF",
     "CNY", "CZK", "DKK", "EUR", "GBP", "GEL",
     "HUF", "ILS", "JPY", "KZT", "MDL", "NOK",
     "PLN", "SEK", "SGD", "TMT", "TRY", "UAH",
-    "USD", "UZS", "XAU", "AUD", "AZN", "BYN",
-    "CAD", "CHF", "CNY", "CZK", "DKK", "EUR", 
-    "GBP", "GEL", "HUF", "ILS", "JPY", "KZT", 
-    "MDL", "NOK", "PLN", "SEK", "SGD", "TMT", 
-    "TRY", "USD", "UZS", "XAU"))
+    "USD", "UZS", "XAU"))
 
-def pars_response(response: dict, currency: list) -> dict:
+#Built once: arg_parsing runs per chat message and the currency list is static
+_INVALID_DAYS_MSG = "Invalid days count! It must be numeric value between 1 and 10"
+_INVALID_CURRENCY_MSG = ("Invalid currency! Use one of available currencies:\n"
+                         + ", ".join(sorted(API_CURRENCIES)))
+
+def pars_response(response: dict, currency: frozenset) -> dict:
     """Cuts all additional information from response
 
     Args:
         response (dict): dict of currency exchanges
-        currencies (list): additional currency
+        currency (frozenset): currencies to keep in result
 
     Returns:
         dict: dictionary like {date1: 
@@ -42,31 +77,39 @@ def pars_response(response: dict, currency: list) -> dict:
     if rates is None:
         return exchange_rate
     for curr in rates:
-        if curr["currency"] in currency:
-            exchange_rate.update({
-                    curr["currency"]: 
-                        {
-                        "sale": curr.get("saleRate", 
-                                    curr.get("saleRateNB", "unavailable")),
-                        "purchase": curr.get("purchaseRate", 
-                                    curr.get("purchaseRateNB", "unavailable"))
-                        }
-                    })
-        
+        name = curr["currency"]
+        if name not in currency:
+            continue
+        exchange_rate[name] = {
+            "sale": curr.get("saleRate",
+                        curr.get("saleRateNB", "unavailable")),
+            "purchase": curr.get("purchaseRate",
+                        curr.get("purchaseRateNB", "unavailable"))
+            }
+
     return {response["date"]: exchange_rate}
             
+#Single-pass escape table for free-form strings interpolated into html
+_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
 def response_to_html(response: Iterable) -> str:
-    """Converts python dictionaries to html for pretty view"""
+    """Converts exchange rates dictionaries to html for pretty view"""
     if not isinstance(response, Iterable):
         return response
-    html = ""
+    out = ["<ul>"]
     for el in response:
-        html += str(el).replace("'", "")\
-                        .replace("{", "<ul><li>")\
-                        .replace(",", "</li><li>")\
-                        .replace("}", "</li></ul>")
-    
-    return html
+        if not isinstance(el, dict):
+            out.append(f"<li>{str(el).translate(_HTML_ESCAPE)}</li>")
+            continue
+        for day, rates in el.items():
+            out.append(f"<li>{day}<ul>")
+            for cur, prices in rates.items():
+                out.append(f"<li>{cur}<ul><li>sale: {prices['sale']}</li>"
+                           f"<li>purchase: {prices['purchase']}</li></ul></li>")
+            out.append("</ul></li>")
+    out.append("</ul>")
+
+    return "".join(out)
 
 def connection_errors(func):
     """Connection errors decorator for asynchronic requests
@@ -111,13 +154,29 @@ async def get_request(url: str, session: aiohttp.ClientSession) -> dict:
     """
     async with session.get(url) as resp:
         if resp.status == 200:
-            result = await resp.json()
+            result = await resp.json(loads=orjson.loads)
         else:
             result = f"Error status: {resp.status} for {url}"
-        
+
         return result
-    
-async def exchange_rates(days: int=1, currency: [str]=[]) -> list[dict]:
+
+@lru_cache(maxsize=32)
+def _url_for(request_date: date) -> str:
+    """Builds the request url for a date; repeated dates hit the cache"""
+    return url + request_date.strftime(DATE_FORMAT)
+
+def _cache_valid(request_date: date, today: date) -> bool:
+    """Checks whether a cached entry for the date is still usable.
+
+    Past dates never change; today's rate is kept for _TODAY_TTL seconds.
+    """
+    if request_date not in _RATE_CACHE:
+        return False
+    if request_date != today:
+        return True
+    return time() - _CACHE_TIME.get(request_date, 0) < _TODAY_TTL
+
+async def exchange_rates(days: int=1, currency: tuple[str, ...]=()) -> list[dict]:
     """Creates requests by completting 'url' with date 
     from today date to date today - days.
     One date per request
@@ -131,23 +190,47 @@ async def exchange_rates(days: int=1, currency: [str]=[]) -> list[dict]:
         EUR and USD as currencies
     """
     
-    currency.extend(base_currency)
+    wanted = frozenset(currency).union(BASE_CURRENCY)
     if days > MAX_DAYS:
         days = MAX_DAYS
     
     cur_date = date.today()
-    requests = []
+    dates = [cur_date - timedelta(days=day) for day in range(days)]
+    dates_needed = [d for d in dates if not _cache_valid(d, cur_date)]
+    errors = {}
+    if dates_needed:
+        session = await get_session()
+        sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async def one_day(request_date: date):
+            try:
+                async with sem, asyncio.timeout(REQUEST_TIMEOUT):
+                    return await get_request(_url_for(request_date), session)
+            except TimeoutError:
+                return f"Request timed out for {request_date.strftime(DATE_FORMAT)}"
+
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(one_day(d)) for d in dates_needed]
+        cources = [task.result() for task in tasks]
+
+        for request_date, course in zip(dates_needed, cources):
+            if isinstance(course, dict):
+                #Cache all currencies so calls with other lists also hit
+                _RATE_CACHE[request_date] = pars_response(course, API_CURRENCIES)
+                _CACHE_TIME[request_date] = time()
+            else:
+                errors[request_date] = course
+
     result = []
-    async with aiohttp.ClientSession() as session:
-        for day in range(days):
-            request_date = cur_date - timedelta(days=day)
-            requests.append(get_request(url + request_date.strftime(DATE_FORMAT), session))
-        
-        cources = await asyncio.gather(*requests)
+    for request_date in dates:
+        cached = _RATE_CACHE.get(request_date)
+        if cached is None:
+            result.append(errors.get(request_date, {}))
+            continue
+        result.append({day: {cur: rate for cur, rate in rates.items()
+                             if cur in wanted}
+                       for day, rates in cached.items()})
 
-        for course in cources:
-            result.append(pars_response(course, currency))
-        
     return result
 
 def arg_parsing(args: list[str]) -> tuple[bool, str]:
@@ -165,20 +248,20 @@ def arg_parsing(args: list[str]) -> tuple[bool, str]:
     kwargs = {}
     #Try to parse days count
     if len(args) > 1:
-        if args[1].isdecimal():
+        try:
             kwargs["days"] = int(args[1])
-        else:
-            message = "Invalid days count! It must be numeric value between 1 and 10"
-            return (kwargs, message)
+        except ValueError:
+            return (kwargs, _INVALID_DAYS_MSG)
+        if kwargs["days"] < 1:
+            return (kwargs, _INVALID_DAYS_MSG)
     
     #Try to parse additional currencies
     if len(args) > 2:
         currencies = args[2].upper().split(",")
         if API_CURRENCIES.issuperset(currencies):
-            kwargs["currency"] = currencies
+            kwargs["currency"] = tuple(currencies)
         else:
-            message = "Invalid currency! Use one of available currencies:\n" + ", ".join(API_CURRENCIES)
-            return (kwargs, message)
+            return (kwargs, _INVALID_CURRENCY_MSG)
     
     return (kwargs, message)
         
@@ -187,9 +270,13 @@ if __name__ == '__main__':
     kwargs, message = arg_parsing(argv)
     if not message:
         start = time()
-        if platform.system() == 'Windows':
-            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-        result = asyncio.run(exchange_rates(**kwargs))
+        async def run_and_close(**kwargs):
+            try:
+                return await exchange_rates(**kwargs)
+            finally:
+                await close_session()
+
+        result = asyncio.run(run_and_close(**kwargs))
         fin = time()
         pprint(result, fin - start)
     else:
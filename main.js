@@ -12,11 +12,51 @@ ws.onopen = (e) => {
     console.log('Hello WebSocket!')
 }
 
+const renderRates = (rates) => {
+    const ul = document.createElement('ul')
+    for (const day of rates) {
+        if (typeof day !== 'object' || day === null) {
+            const li = document.createElement('li')
+            li.textContent = day
+            ul.appendChild(li)
+            continue
+        }
+        for (const [date, currencies] of Object.entries(day)) {
+            const liDay = document.createElement('li')
+            liDay.textContent = date
+            const ulCur = document.createElement('ul')
+            for (const [currency, prices] of Object.entries(currencies)) {
+                const liCur = document.createElement('li')
+                liCur.textContent = `${currency} sale: ${prices.sale}, purchase: ${prices.purchase}`
+                ulCur.appendChild(liCur)
+            }
+            liDay.appendChild(ulCur)
+            ul.appendChild(liDay)
+        }
+    }
+    return ul
+}
+
 ws.onmessage = (e) => {
     console.log(e.data)
     text = e.data
 
     const elMsg = document.createElement('div')
-    elMsg.innerHTML = text
+    const marker = ' result:'
+    const pos = text.indexOf(marker)
+    let rendered = false
+    if (pos !== -1) {
+        try {
+            const rates = JSON.parse(text.slice(pos + marker.length))
+            elMsg.textContent = text.slice(0, pos + marker.length)
+            elMsg.appendChild(renderRates(rates))
+            rendered = true
+        } catch (err) {
+            //Not a rates payload, show it as plain text below
+        }
+    }
+    if (!rendered) {
+        elMsg.textContent = text
+    }
     subscribe.appendChild(elMsg)
-}
\ No newline at end of file
+}
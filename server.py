@@ -1,37 +1,65 @@
 import asyncio
 import logging
+import random
+import sys
+import weakref
 import names
-from websockets import WebSocketServerProtocol, serve
+import orjson
+from websockets import WebSocketServerProtocol, broadcast, serve
 from websockets.exceptions import ConnectionClosedOK
 import exchange
 from async_log import AsyncLogger
 
 logging.basicConfig(level=logging.INFO)
 
+#aiohttp needs the selector loop on Windows; set it once at import
+if sys.platform == 'win32':
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+def _load_names(kind: str) -> list[str]:
+    with open(names.FILES[kind]) as fh:
+        return [line.split()[0].capitalize() for line in fh]
+
+#names.get_full_name re-reads its data files on every call; load once
+_FIRST_NAMES = _load_names("first:male") + _load_names("first:female")
+_LAST_NAMES = _load_names("last")
+
+def _fast_name() -> str:
+    return f"{random.choice(_FIRST_NAMES)} {random.choice(_LAST_NAMES)}"
+
 
 class Server:
-    clients = set()
     log_file = "log.log"
     __file_logger: AsyncLogger = None
 
+    def __init__(self):
+        #WeakSet so a missed unregister can't pin a closed connection
+        self.clients = weakref.WeakSet()
+
     async def logger(self):
         if self.__file_logger is None:
             self.__file_logger = AsyncLogger("%d.%m.%Y %H:%M:%S.%f")
             await self.__file_logger.set_file(self.log_file)
         return self.__file_logger
 
+    async def close_logger(self):
+        if self.__file_logger is not None:
+            await self.__file_logger.aclose()
+            self.__file_logger = None
+
     async def register(self, ws: WebSocketServerProtocol):
-        ws.name = names.get_full_name()
+        ws.name = _fast_name()
         self.clients.add(ws)
         logging.info(f'{ws.remote_address} connects')
 
     async def unregister(self, ws: WebSocketServerProtocol):
-        self.clients.remove(ws)
+        self.clients.discard(ws)
         logging.info(f'{ws.remote_address} disconnects')
 
     async def send_to_clients(self, message: str):
         if self.clients:
-            [await client.send(message) for client in self.clients]
+            #Snapshot: the WeakSet may shrink while broadcast iterates
+            broadcast(list(self.clients), message)
 
     async def ws_handler(self, ws: WebSocketServerProtocol):
         await self.register(ws)
@@ -58,13 +86,18 @@ class Server:
                 result += error_message
             else:
                 exchange_rates = await exchange.exchange_rates(**kwargs)
-                result += exchange.response_to_html(exchange_rates)
+                #The browser renders the rates itself, no HTML munging here
+                result += orjson.dumps(exchange_rates).decode()
         return result
 
 async def main():
     server = Server()
-    async with serve(server.ws_handler, 'localhost', 8080):
-        await asyncio.Future()  # run forever
+    try:
+        async with serve(server.ws_handler, 'localhost', 8080):
+            await asyncio.Future()  # run forever
+    finally:
+        await server.close_logger()
+        await exchange.close_session()
 
 if __name__ == '__main__':
     asyncio.run(main())
\ No newline at end of file